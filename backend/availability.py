@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List
+
+import numpy as np
+
+# We have 2 masks total
+MASKS_TOTAL = 2
+# How many days ahead (starting tomorrow) are offered for booking
+BOOKING_HORIZON_DAYS = 30
+# Show only first N available dates
+MAX_OFFERED_DATES = 7
+
+def pick_available_dates(bookings: Iterable[dict], today: datetime, masks_needed: int, days_needed: int) -> List[datetime]:
+    """Pick start dates whose whole rental period has enough free masks.
+
+    ``today`` is midnight UTC. Bookings are dicts with ``start_date``/``end_date``
+    (naive datetimes are treated as UTC) and optional ``masks_count``; a missing
+    count occupies every mask.
+    """
+    # Masks occupied per day, indexed by offset from today
+    window = BOOKING_HORIZON_DAYS + 1 + days_needed
+    occ = np.zeros(window, dtype=np.int64)
+    for booking in bookings:
+        start = booking["start_date"].replace(tzinfo=timezone.utc)
+        end = booking["end_date"].replace(tzinfo=timezone.utc)
+        # A booking occupies every day it touches: round start down, end up
+        s = max((start - today).days, 0)
+        e = min(-((today - end).days), window)
+        if s < e:
+            occ[s:e] += booking.get("masks_count", MASKS_TOTAL)
+
+    available_dates = []
+    for i in range(1, BOOKING_HORIZON_DAYS + 1):
+        if occ[i:i + days_needed].max() + masks_needed <= MASKS_TOTAL:
+            available_dates.append(today + timedelta(days=i))
+
+        if len(available_dates) >= MAX_OFFERED_DATES:
+            break
+
+    return available_dates
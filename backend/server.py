@@ -1,7 +1,9 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends, Query
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
 import os
 import logging
 from pathlib import Path
@@ -10,17 +12,30 @@ from typing import List, Optional
 import uuid
 from datetime import datetime, timedelta, timezone
 from telegram import Bot, Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.request import HTTPXRequest
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters, ContextTypes
 import asyncio
 import httpx
 import json
+import time
+import redis.asyncio as redis
+
+from availability import BOOKING_HORIZON_DAYS, MASKS_TOTAL, pick_available_dates
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=50,
+    minPoolSize=5,
+    serverSelectionTimeoutMS=3000,
+    connectTimeoutMS=3000,
+    waitQueueTimeoutMS=2000,
+    retryWrites=True
+)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
@@ -32,14 +47,17 @@ api_router = APIRouter(prefix="/api")
 # Telegram Bot setup
 bot_token = os.environ['TELEGRAM_TOKEN']
 admin_username = os.environ['ADMIN_USERNAME']
-bot = Bot(token=bot_token)
+# One pooled HTTP/2 connection set shared by webhook replies and admin notifications
+bot = Bot(token=bot_token, request=HTTPXRequest(connection_pool_size=20, http_version="2"))
 
 # Initialize Telegram Application
 telegram_app = None
+telegram_initialized = False
+telegram_init_lock = asyncio.Lock()
 
 async def init_telegram_app():
     global telegram_app
-    telegram_app = Application.builder().token(bot_token).build()
+    telegram_app = Application.builder().bot(bot).build()
     
     # Add handlers
     telegram_app.add_handler(CommandHandler("start", start_command))
@@ -73,8 +91,16 @@ class BookingCreate(BaseModel):
     start_date: datetime
     delivery_address: str
 
-# User session storage (in production, use Redis or similar)
-user_sessions = {}
+class BookingStatusBulkUpdate(BaseModel):
+    ids: List[str] = Field(min_length=1)
+    status: str
+
+# User session storage (Redis, expires abandoned booking flows)
+redis_url = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+redis_client = None
+SESSION_TTL = 1800  # seconds
+# How long a processed update_id is remembered to drop redelivered updates
+UPDATE_DEDUPE_TTL = 3600  # seconds
 
 # Pricing configuration
 PRICES = {
@@ -82,59 +108,151 @@ PRICES = {
     2: {1: 140, 2: 260, 3: 360}   # 2 masks
 }
 
+# Bookings that hold masks; matches the partial index filter
+ACTIVE_BOOKINGS_FILTER = {"status": {"$in": ["pending", "confirmed"]}}
+
+STATUS_EMOJI = {"pending": "⏳", "confirmed": "✅", "completed": "✔️", "cancelled": "❌"}
+
+# Static inline keyboards
+START_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🥽 Забронировать маски", callback_data="start_booking")]
+])
+
+MASKS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("1️⃣ Одна маска", callback_data="masks_1")],
+    [InlineKeyboardButton("2️⃣ Две маски", callback_data="masks_2")]
+])
+
+DAYS_KEYBOARDS = {
+    masks: InlineKeyboardMarkup([
+        [InlineKeyboardButton(f"1️⃣ день - {prices[1]}₽", callback_data="days_1")],
+        [InlineKeyboardButton(f"2️⃣ дня - {prices[2]}₽", callback_data="days_2")],
+        [InlineKeyboardButton(f"3️⃣ дня - {prices[3]}₽", callback_data="days_3")]
+    ])
+    for masks, prices in PRICES.items()
+}
+
+# Fields needed to render booking summaries in the admin panel
+ADMIN_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "status": 1,
+    "start_date": 1,
+    "end_date": 1,
+    "masks_count": 1,
+    "price": 1,
+    "first_name": 1
+}
+
+# Availability cache: (masks_needed, days_needed, date) -> (timestamp, dates)
+_avail_cache = {}
+# Bumped on every invalidation so lookups that were in flight don't store stale dates
+_avail_cache_generation = 0
+AVAILABILITY_CACHE_TTL = 60  # seconds
+
+# How often stale pending bookings are cancelled
+PENDING_SWEEP_INTERVAL = 3600  # seconds
+sweep_task = None
+
+# Strong references to fire-and-forget tasks so they are not garbage-collected
+background_tasks = set()
+
 # Helper functions
+def run_in_background(coro):
+    """Schedule coroutine without waiting for its result"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+def invalidate_availability_cache():
+    """Drop cached availability after bookings change"""
+    global _avail_cache_generation
+    _avail_cache_generation += 1
+    _avail_cache.clear()
+
+def _decode_session(raw: Optional[str]):
+    """Deserialize session stored in Redis"""
+    if raw is None:
+        return None
+    
+    session = json.loads(raw)
+    if "start_date" in session:
+        session["start_date"] = datetime.fromisoformat(session["start_date"])
+    if "available_dates" in session:
+        session["available_dates"] = {
+            key: datetime.fromisoformat(value) for key, value in session["available_dates"].items()
+        }
+    return session
+
+async def get_session(user_id: int):
+    """Get booking session for user"""
+    return _decode_session(await redis_client.get(f"session:{user_id}"))
+
+async def pop_session(user_id: int):
+    """Atomically get and delete booking session for user"""
+    return _decode_session(await redis_client.getdel(f"session:{user_id}"))
+
+async def set_session(user_id: int, data: dict, ex: int = SESSION_TTL):
+    """Store booking session for user"""
+    await redis_client.set(f"session:{user_id}", json.dumps(data, default=datetime.isoformat), ex=ex)
+
 async def get_available_dates(masks_needed: int, days_needed: int):
     """Get available dates for booking"""
     today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    available_dates = []
     
-    # Check next 30 days
-    for i in range(1, 31):
-        check_date = today + timedelta(days=i)
-        end_date = check_date + timedelta(days=days_needed)
-        
-        # Count existing bookings for this period
-        existing_bookings = await db.bookings.count_documents({
-            "status": {"$in": ["pending", "confirmed"]},
-            "$or": [
-                {"start_date": {"$lt": end_date, "$gte": check_date}},
-                {"end_date": {"$gt": check_date, "$lte": end_date}},
-                {"start_date": {"$lte": check_date}, "end_date": {"$gte": end_date}}
-            ]
-        })
-        
-        # Get total masks booked for this period
-        pipeline = [
-            {
-                "$match": {
-                    "status": {"$in": ["pending", "confirmed"]},
-                    "$or": [
-                        {"start_date": {"$lt": end_date, "$gte": check_date}},
-                        {"end_date": {"$gt": check_date, "$lte": end_date}},
-                        {"start_date": {"$lte": check_date}, "end_date": {"$gte": end_date}}
-                    ]
-                }
-            },
-            {
-                "$group": {
-                    "_id": None,
-                    "total_masks": {"$sum": "$masks_count"}
-                }
+    cache_key = (masks_needed, days_needed, today.date())
+    cached = _avail_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < AVAILABILITY_CACHE_TTL:
+        return cached[1]
+    
+    generation = _avail_cache_generation
+    horizon = today + timedelta(days=BOOKING_HORIZON_DAYS + 1 + days_needed)
+    
+    # With both masks requested any overlapping booking blocks the day,
+    # so only the booking period is needed
+    projection = {"_id": 0, "start_date": 1, "end_date": 1}
+    if masks_needed < MASKS_TOTAL:
+        projection["masks_count"] = 1
+    
+    # Fetch every booking overlapping the 30-day window in a single round-trip
+    pipeline = [
+        {
+            "$match": {
+                "status": {"$in": ["pending", "confirmed"]},
+                "start_date": {"$lt": horizon},
+                "end_date": {"$gt": today}
             }
-        ]
-        
-        result = await db.bookings.aggregate(pipeline).to_list(1)
-        booked_masks = result[0]["total_masks"] if result else 0
-        
-        # We have 2 masks total
-        if booked_masks + masks_needed <= 2:
-            available_dates.append(check_date)
-        
-        if len(available_dates) >= 7:  # Show only first 7 available dates
-            break
+        },
+        {"$project": projection}
+    ]
+    bookings = await db.bookings.aggregate(pipeline).to_list(None)
+    
+    available_dates = pick_available_dates(bookings, today, masks_needed, days_needed)
     
+    if generation == _avail_cache_generation:
+        _avail_cache[cache_key] = (time.monotonic(), available_dates)
     return available_dates
 
+async def cancel_expired_pending_bookings():
+    """Cancel pending bookings whose rental period has already ended"""
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    result = await db.bookings.update_many(
+        {"status": "pending", "end_date": {"$lt": today}},
+        {"$set": {"status": "cancelled"}}
+    )
+    if result.modified_count:
+        logger.info(f"Cancelled {result.modified_count} expired pending bookings")
+
+async def sweep_pending_bookings():
+    """Periodically cancel expired pending bookings"""
+    while True:
+        try:
+            await cancel_expired_pending_bookings()
+        except Exception as e:
+            logging.error(f"Pending bookings sweep failed: {e}")
+        await asyncio.sleep(PENDING_SWEEP_INTERVAL)
+
 async def send_admin_notification(booking: Booking):
     """Send notification to admin about new booking"""
     try:
@@ -178,12 +296,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 Нажмите кнопку ниже, чтобы начать бронирование! 👇"""
 
-    keyboard = [
-        [InlineKeyboardButton("🥽 Забронировать маски", callback_data="start_booking")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await update.message.reply_text(welcome_message, reply_markup=reply_markup)
+    await update.message.reply_text(welcome_message, reply_markup=START_KEYBOARD)
 
 async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /admin command"""
@@ -195,12 +308,13 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Get current bookings
     today = datetime.now(timezone.utc)
-    active_bookings = await db.bookings.count_documents({
-        "status": {"$in": ["pending", "confirmed"]},
-        "end_date": {"$gte": today}
-    })
-    
-    total_bookings = await db.bookings.count_documents({})
+    total_bookings, active_bookings = await asyncio.gather(
+        db.bookings.estimated_document_count(),
+        db.bookings.count_documents({
+            "status": {"$in": ["pending", "confirmed"]},
+            "end_date": {"$gte": today}
+        })
+    )
     
     keyboard = [
         [InlineKeyboardButton("📋 Все бронирования", callback_data="admin_all_bookings")],
@@ -229,47 +343,39 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if data == "start_booking":
         # Step 1: Choose number of masks
-        keyboard = [
-            [InlineKeyboardButton("1️⃣ Одна маска", callback_data="masks_1")],
-            [InlineKeyboardButton("2️⃣ Две маски", callback_data="masks_2")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await query.edit_message_text(
             "🥽 Сколько масок хотите взять в аренду?",
-            reply_markup=reply_markup
+            reply_markup=MASKS_KEYBOARD
         )
     
     elif data.startswith("masks_"):
         masks_count = int(data.split("_")[1])
-        user_sessions[user_id] = {"masks_count": masks_count}
+        await set_session(user_id, {"masks_count": masks_count})
         
         # Step 2: Choose rental duration
-        keyboard = [
-            [InlineKeyboardButton(f"1️⃣ день - {PRICES[masks_count][1]}₽", callback_data="days_1")],
-            [InlineKeyboardButton(f"2️⃣ дня - {PRICES[masks_count][2]}₽", callback_data="days_2")],
-            [InlineKeyboardButton(f"3️⃣ дня - {PRICES[masks_count][3]}₽", callback_data="days_3")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         mask_word = "маску" if masks_count == 1 else "маски"
         await query.edit_message_text(
             f"📅 На сколько дней берете {mask_word}?",
-            reply_markup=reply_markup
+            reply_markup=DAYS_KEYBOARDS[masks_count]
         )
     
     elif data.startswith("days_"):
         days_count = int(data.split("_")[1])
-        if user_id not in user_sessions:
+        session = await get_session(user_id)
+        if session is None:
             await query.edit_message_text("❌ Сессия истекла. Начните заново с /start")
             return
             
-        user_sessions[user_id]["days_count"] = days_count
-        masks_count = user_sessions[user_id]["masks_count"]
+        masks_count = session["masks_count"]
         
         # Get available dates
         available_dates = await get_available_dates(masks_count, days_count)
         
+        # Remember offered dates so the date step can validate the choice
+        session["days_count"] = days_count
+        session["available_dates"] = {d.strftime("%Y-%m-%d"): d for d in available_dates}
+        await set_session(user_id, session)
+        
         if not available_dates:
             await query.edit_message_text(
                 "😔 К сожалению, на ближайшие 30 дней нет свободных дат для выбранного периода.\n\nПопробуйте изменить количество дней или масок.",
@@ -295,16 +401,25 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     elif data.startswith("date_"):
         date_str = data.split("_")[1]
-        start_date = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
         
-        if user_id not in user_sessions:
+        session = await get_session(user_id)
+        if session is None:
             await query.edit_message_text("❌ Сессия истекла. Начните заново с /start")
             return
         
-        user_sessions[user_id]["start_date"] = start_date
+        # Only dates offered in the previous step can be booked; they stay in the
+        # session until the booking is created, so re-picking is checked too
+        offered_dates = session.get("available_dates", {})
+        if date_str not in offered_dates:
+            await query.edit_message_text("❌ Эта дата недоступна. Начните заново с /start")
+            return
+        start_date = offered_dates[date_str]
+        
+        session["start_date"] = start_date
+        await set_session(user_id, session)
         
         # Step 4: Ask for delivery address
-        days_count = user_sessions[user_id]["days_count"]
+        days_count = session["days_count"]
         end_date = start_date + timedelta(days=days_count)
         
         await query.edit_message_text(
@@ -318,13 +433,14 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
         
         if data == "admin_all_bookings":
-            bookings = await db.bookings.find().sort("created_at", -1).limit(10).to_list(10)
-            message = "📋 Последние 10 бронирований:\n\n"
-            
-            for booking in bookings:
-                b = Booking(**booking)
-                status_emoji = {"pending": "⏳", "confirmed": "✅", "completed": "✔️", "cancelled": "❌"}
-                message += f"{status_emoji.get(b.status, '❓')} {b.start_date.strftime('%d.%m')} | {b.masks_count}🥽 | {b.price}₽\n"
+            bookings = await db.bookings.find(
+                projection=ADMIN_SUMMARY_PROJECTION
+            ).sort("created_at", -1).limit(10).to_list(10)
+            lines = [
+                f"{STATUS_EMOJI.get(b['status'], '❓')} {b['start_date']:%d.%m} | {b['masks_count']}🥽 | {b['price']}₽\n"
+                for b in bookings
+            ]
+            message = "📋 Последние 10 бронирований:\n\n" + "".join(lines)
             
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data="admin_back")]]
             await query.edit_message_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
@@ -334,16 +450,15 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             bookings = await db.bookings.find({
                 "status": {"$in": ["pending", "confirmed"]},
                 "end_date": {"$gte": today}
-            }).sort("start_date", 1).to_list(20)
+            }, projection=ADMIN_SUMMARY_PROJECTION).sort("start_date", 1).to_list(20)
             
-            message = "⏳ Активные бронирования:\n\n"
-            
-            for booking in bookings:
-                b = Booking(**booking)
-                status_emoji = {"pending": "⏳", "confirmed": "✅"}
-                message += f"{status_emoji.get(b.status, '❓')} {b.start_date.strftime('%d.%m')} - {b.end_date.strftime('%d.%m')}\n"
-                message += f"   🥽 {b.masks_count} маски | 💰 {b.price}₽\n"
-                message += f"   👤 {b.first_name or 'Неизвестно'}\n\n"
+            lines = [
+                f"{STATUS_EMOJI.get(b['status'], '❓')} {b['start_date']:%d.%m} - {b['end_date']:%d.%m}\n"
+                f"   🥽 {b['masks_count']} маски | 💰 {b['price']}₽\n"
+                f"   👤 {b.get('first_name') or 'Неизвестно'}\n\n"
+                for b in bookings
+            ]
+            message = "⏳ Активные бронирования:\n\n" + "".join(lines)
             
             if not bookings:
                 message += "Нет активных бронирований."
@@ -355,16 +470,28 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             today = datetime.now(timezone.utc)
             month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
             
-            total_bookings = await db.bookings.count_documents({})
-            monthly_bookings = await db.bookings.count_documents({"created_at": {"$gte": month_start}})
-            
-            # Calculate monthly revenue
+            # Monthly and revenue counters in one round-trip, total from collection metadata
             pipeline = [
-                {"$match": {"created_at": {"$gte": month_start}, "status": {"$ne": "cancelled"}}},
-                {"$group": {"_id": None, "total_revenue": {"$sum": "$price"}}}
+                {
+                    "$facet": {
+                        "monthly": [
+                            {"$match": {"created_at": {"$gte": month_start}}},
+                            {"$count": "n"}
+                        ],
+                        "revenue": [
+                            {"$match": {"created_at": {"$gte": month_start}, "status": {"$ne": "cancelled"}}},
+                            {"$group": {"_id": None, "total_revenue": {"$sum": "$price"}}}
+                        ]
+                    }
+                }
             ]
-            result = await db.bookings.aggregate(pipeline).to_list(1)
-            monthly_revenue = result[0]["total_revenue"] if result else 0
+            total_bookings, results = await asyncio.gather(
+                db.bookings.estimated_document_count(),
+                db.bookings.aggregate(pipeline).to_list(1)
+            )
+            result = results[0]
+            monthly_bookings = result["monthly"][0]["n"] if result["monthly"] else 0
+            monthly_revenue = result["revenue"][0]["total_revenue"] if result["revenue"] else 0
             
             message = f"""📊 Статистика:
 
@@ -384,11 +511,17 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle text messages (delivery address)"""
     user_id = update.effective_user.id
     
-    if user_id not in user_sessions or "start_date" not in user_sessions[user_id]:
+    # Text only completes a booking once a date is picked; leave other sessions untouched
+    session = await get_session(user_id)
+    if session is None or "start_date" not in session:
+        return
+    
+    # Claim the session atomically so concurrent messages cannot book twice
+    session = await pop_session(user_id)
+    if session is None or "start_date" not in session:
         return
     
     delivery_address = update.message.text
-    session = user_sessions[user_id]
     
     # Create booking
     start_date = session["start_date"]
@@ -410,7 +543,8 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
     
     # Save to database
-    await db.bookings.insert_one(booking.dict())
+    await db.bookings.insert_one(booking.model_dump())
+    invalidate_availability_cache()
     
     # Send confirmation to user
     mask_word = "маску" if masks_count == 1 else "маски"
@@ -427,14 +561,18 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 Спасибо за выбор нашего сервиса! 🎮"""
     
-    await update.message.reply_text(confirmation_message)
-    
-    # Send notification to admin
-    await send_admin_notification(booking)
+    # Notify admin in the background while the user gets the confirmation
+    run_in_background(send_admin_notification(booking))
     
-    # Clear user session
-    if user_id in user_sessions:
-        del user_sessions[user_id]
+    await update.message.reply_text(confirmation_message)
+
+async def ensure_telegram_initialized():
+    """Initialize the Telegram application exactly once"""
+    global telegram_initialized
+    async with telegram_init_lock:
+        if not telegram_initialized:
+            await telegram_app.initialize()
+            telegram_initialized = True
 
 # FastAPI Routes
 @api_router.post("/webhook")
@@ -444,32 +582,47 @@ async def telegram_webhook(request: Request):
         update_data = await request.json()
         update = Update.de_json(update_data, bot)
         
+        # Telegram and clients retry deliveries that time out; process each update once
+        if not await redis_client.set(f"update:{update.update_id}", 1, nx=True, ex=UPDATE_DEDUPE_TTL):
+            return {"status": "ok"}
+        
         if telegram_app:
             # Ensure the application is initialized
-            if not telegram_app.running:
-                await telegram_app.initialize()
-            await telegram_app.process_update(update)
+            if not telegram_initialized:
+                await ensure_telegram_initialized()
+            # Acknowledge right away so Telegram does not retry slow updates
+            run_in_background(telegram_app.process_update(update))
         
         return {"status": "ok"}
     except Exception as e:
         logging.error(f"Webhook processing failed: {e}")
         raise HTTPException(status_code=500, detail=f"Webhook processing failed: {str(e)}")
 
-@api_router.get("/bookings", response_model=List[Booking])
-async def get_bookings():
-    """Get all bookings"""
-    bookings = await db.bookings.find().sort("created_at", -1).to_list(100)
-    return [Booking(**booking) for booking in bookings]
+# Stored documents already have the Booking shape, so listings return them as-is
+# instead of validating every row again; the schema is only declared for the docs
+BOOKING_LIST_RESPONSES = {200: {"model": List[Booking]}}
 
-@api_router.get("/bookings/active", response_model=List[Booking])
+@api_router.get("/bookings", response_model=None, responses=BOOKING_LIST_RESPONSES)
+async def get_bookings(limit: int = Query(100, ge=1, le=100)):
+    """Get latest bookings"""
+    bookings = await db.bookings.find(projection={"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
+    return bookings
+
+@api_router.get("/bookings/active", response_model=None, responses=BOOKING_LIST_RESPONSES)
 async def get_active_bookings():
     """Get active bookings"""
     today = datetime.now(timezone.utc)
     bookings = await db.bookings.find({
         "status": {"$in": ["pending", "confirmed"]},
         "end_date": {"$gte": today}
-    }).sort("start_date", 1).to_list(100)
-    return [Booking(**booking) for booking in bookings]
+    }, projection={"_id": 0}).sort("start_date", 1).to_list(100)
+    return bookings
+
+@api_router.get("/availability", response_model=List[str])
+async def get_availability(masks: int = Query(..., ge=1, le=MASKS_TOTAL), days: int = Query(..., ge=1, le=3)):
+    """Get start dates the bot currently offers"""
+    available_dates = await get_available_dates(masks, days)
+    return [date.strftime("%Y-%m-%d") for date in available_dates]
 
 @api_router.put("/bookings/{booking_id}/status")
 async def update_booking_status(booking_id: str, status: str):
@@ -482,8 +635,24 @@ async def update_booking_status(booking_id: str, status: str):
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Booking not found")
     
+    invalidate_availability_cache()
     return {"status": "updated"}
 
+@api_router.put("/bookings/status/bulk")
+async def bulk_update_booking_status(payload: BookingStatusBulkUpdate):
+    """Update status of several bookings at once"""
+    operations = [
+        UpdateOne({"id": booking_id}, {"$set": {"status": payload.status}})
+        for booking_id in payload.ids
+    ]
+    result = await db.bookings.bulk_write(operations, ordered=False)
+    
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Bookings not found")
+    
+    invalidate_availability_cache()
+    return {"status": "updated", "matched": result.matched_count, "modified": result.modified_count}
+
 @api_router.delete("/bookings/{booking_id}")
 async def delete_booking(booking_id: str):
     """Delete booking"""
@@ -492,6 +661,7 @@ async def delete_booking(booking_id: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Booking not found")
     
+    invalidate_availability_cache()
     return {"status": "deleted"}
 
 # Include the router in the main app
@@ -515,11 +685,50 @@ logger = logging.getLogger(__name__)
 @app.on_event("startup")
 async def startup_event():
     """Initialize Telegram bot on startup"""
-    global telegram_app
+    global telegram_app, redis_client, sweep_task
+    
+    redis_client = redis.from_url(redis_url, decode_responses=True)
+
+    # Indexes for availability, active-booking and listing queries.
+    # Status indexes only cover active bookings so they stay small as history grows.
+    # Build the partial indexes before dropping the full ones they replace, so a
+    # failure never leaves the collection without status indexes
+    try:
+        await db.bookings.create_index(
+            [("status", 1), ("end_date", 1)],
+            name="active_status_end_date",
+            partialFilterExpression=ACTIVE_BOOKINGS_FILTER
+        )
+        await db.bookings.create_index(
+            [("status", 1), ("start_date", 1), ("end_date", 1)],
+            name="active_status_start_date_end_date",
+            partialFilterExpression=ACTIVE_BOOKINGS_FILTER
+        )
+    except OperationFailure as e:
+        logging.error(f"Failed to create partial status indexes, using full ones: {e}")
+        await db.bookings.create_index([("status", 1), ("end_date", 1)])
+        await db.bookings.create_index([("status", 1), ("start_date", 1), ("end_date", 1)])
+    else:
+        for name in ("status_1_end_date_1", "status_1_start_date_1_end_date_1"):
+            try:
+                await db.bookings.drop_index(name)
+            except OperationFailure:
+                # Already dropped, possibly by another worker starting up
+                pass
+    await db.bookings.create_index([("id", 1)], unique=True)
+    await db.bookings.create_index([("created_at", -1)])
+    logger.info("MongoDB indexes ensured")
+    
+    sweep_task = asyncio.create_task(sweep_pending_bookings())
+
     telegram_app = await init_telegram_app()
-    await telegram_app.initialize()
+    await ensure_telegram_initialized()
     logger.info("Telegram bot initialized")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    if sweep_task:
+        sweep_task.cancel()
+    client.close()
+    if redis_client:
+        await redis_client.aclose()
\ No newline at end of file
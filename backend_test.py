@@ -1,4 +1,4 @@
-import requests
+import httpx
 import sys
 import json
 from datetime import datetime, timezone, timedelta
@@ -10,25 +10,22 @@ class VRRentalBotTester:
         self.tests_run = 0
         self.tests_passed = 0
         self.created_booking_id = None
+        self.client = httpx.Client(http2=True, timeout=10.0, headers={'Content-Type': 'application/json'})
+
+    def close(self):
+        """Close the shared HTTP client"""
+        self.client.close()
 
     def run_test(self, name, method, endpoint, expected_status, data=None, params=None):
         """Run a single API test"""
         url = f"{self.base_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
 
         self.tests_run += 1
         print(f"\n🔍 Testing {name}...")
         print(f"   URL: {url}")
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, params=params)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, params=params)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
+            response = self.client.request(method, url, json=data, params=params)
 
             success = response.status_code == expected_status
             if success:
@@ -222,6 +219,8 @@ def main():
     print("\n❌ Testing Error Handling...")
     error_handling_success = tester.test_invalid_endpoints()
     
+    tester.close()
+    
     # Print final results
     print("\n" + "=" * 50)
     print(f"📊 Test Results Summary:")
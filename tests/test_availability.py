@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+from availability import MAX_OFFERED_DATES, pick_available_dates
+
+TODAY = datetime(2025, 3, 10, tzinfo=timezone.utc)
+
+
+def day(offset, hour=0):
+    return TODAY + timedelta(days=offset, hours=hour)
+
+
+def booking(start, end, masks=None):
+    b = {"start_date": start, "end_date": end}
+    if masks is not None:
+        b["masks_count"] = masks
+    return b
+
+
+def offsets(dates):
+    return [(d - TODAY).days for d in dates]
+
+
+def test_no_bookings_offers_first_dates_from_tomorrow_up_to_cap():
+    dates = pick_available_dates([], TODAY, masks_needed=1, days_needed=1)
+    assert offsets(dates) == list(range(1, MAX_OFFERED_DATES + 1))
+
+
+def test_cap_stops_after_seven_dates():
+    bookings = [booking(day(1), day(3), masks=2)]
+    dates = pick_available_dates(bookings, TODAY, masks_needed=2, days_needed=1)
+    assert len(dates) == MAX_OFFERED_DATES
+    assert offsets(dates) == list(range(3, 3 + MAX_OFFERED_DATES))
+
+
+def test_booking_started_before_today_blocks_remaining_days():
+    bookings = [booking(day(-5), day(3), masks=2)]
+    dates = pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=1)
+    assert offsets(dates)[0] == 3
+
+
+def test_end_date_is_exclusive_at_midnight():
+    bookings = [booking(day(1), day(2), masks=2)]
+    dates = pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=1)
+    assert offsets(dates)[:2] == [2, 3]
+
+
+def test_booking_reaching_past_window_end_is_clamped():
+    # Only the last offered day is free; the second booking runs past the window
+    bookings = [
+        booking(day(1), day(30), masks=2),
+        booking(day(31), day(45), masks=2),
+    ]
+    dates = pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=1)
+    assert offsets(dates) == [30]
+    assert pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=2) == []
+
+
+def test_non_midnight_timestamps_occupy_every_touched_day():
+    bookings = [booking(day(2, hour=15), day(3, hour=10), masks=2)]
+    dates = pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=1)
+    assert offsets(dates)[:3] == [1, 4, 5]
+
+
+def test_naive_datetimes_are_treated_as_utc():
+    naive = booking(day(1).replace(tzinfo=None), day(2).replace(tzinfo=None), masks=2)
+    dates = pick_available_dates([naive], TODAY, masks_needed=1, days_needed=1)
+    assert offsets(dates)[0] == 2
+
+
+def test_one_mask_fits_next_to_single_mask_booking():
+    bookings = [booking(day(1), day(2), masks=1)]
+    assert offsets(pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=1))[0] == 1
+    assert offsets(pick_available_dates(bookings, TODAY, masks_needed=2, days_needed=1))[0] == 2
+
+
+def test_two_single_mask_bookings_fill_the_day():
+    bookings = [booking(day(1), day(2), masks=1), booking(day(1), day(2), masks=1)]
+    assert offsets(pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=1))[0] == 2
+
+
+def test_missing_masks_count_blocks_the_day():
+    # Two-mask lookups project only the booking period
+    bookings = [booking(day(1), day(2))]
+    assert offsets(pick_available_dates(bookings, TODAY, masks_needed=2, days_needed=1))[0] == 2
+
+
+def test_multi_day_rental_needs_every_day_free():
+    bookings = [booking(day(3), day(4), masks=2)]
+    dates = pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=2)
+    assert offsets(dates)[:2] == [1, 4]
+
+
+def test_fully_booked_window_offers_nothing():
+    bookings = [booking(day(-1), day(40), masks=2)]
+    assert pick_available_dates(bookings, TODAY, masks_needed=1, days_needed=1) == []